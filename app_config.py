@@ -1,19 +1,45 @@
 # app_config.py
 
+import io
 import os
 import json
 import re
-import xml.etree.ElementTree as ET
+import hashlib
+import pickle
+import threading
+from functools import cached_property, lru_cache
+from operator import itemgetter
+from sys import intern
+
+try:
+    from lxml import etree as ET
+    _XML_PARSE_ERROR = ET.XMLSyntaxError
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _XML_PARSE_ERROR = ET.ParseError
+
+try:
+    import orjson as _json
+except ImportError:
+    _json = json
 from tkinter import messagebox
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 import logging
 
-from settings import ENABLE_DEBUG_LOGGING
 from _config_data import CONFIG_DATA
 
 USER_CONFIG_DIR = os.path.join(os.path.expanduser('~'), '.timsCompare')
 USER_VIEW_DEFINITIONS_FILENAME = "user_view_definitions.json"
 
+_VT_SEMI = re.compile(r'\s*([^:;]+?)\s*:\s*([^;]*?)\s*(?:;|$)')
+_VT_COMMA = re.compile(r'\s*([^|,]+?)\s*\|\s*([^,]*?)\s*(?:,|$)')
+_PROPS_RE = re.compile(r'(?m)^[ \t]*([A-Za-z0-9_]+)[ \t]*=[ \t]*([^\r\n]*)')
+_TOOLTIP_SUFFIXES = ('_tooltip', '_custom_tooltip')
+
+# CONFIG_DATA is baked into the build, so the parsed definitions are shared
+# across AppConfig instances within one process, keyed like the disk cache.
+_DEFINITIONS_MEMO: Dict[str, List[Dict]] = {}
+
 PARAMETER_DEPENDENCY_MAP = {
     "IMS_imeX_RampStart": "IMS_imeX_Mode",
     "IMS_imeX_RampEnd": "IMS_imeX_Mode",
@@ -28,106 +54,180 @@ class AppConfig:
         self.theme_path = os.path.join("config", "blue_theme.json")
 
         self.user_view_definitions_path = os.path.join(USER_CONFIG_DIR, USER_VIEW_DEFINITIONS_FILENAME)
-        
-        self._all_definitions: Optional[List[Dict]] = None
-        self._parameter_definitions: Optional[Dict[str, List[str]]] = None
-        self._parameter_definitions: Optional[List[str]] = None
-        self._display_name_map: Optional[Dict[str, str]] = None
-        self._third_party_licenses: Optional[Dict] = None
-        
-    @property
+
+        # Both indexes are filled in one traversal of the embedded data.
+        self._cfg_items = []
+        self._basename_index = {}
+        basename = os.path.basename
+        for k, v in CONFIG_DATA.items():
+            if k.lower().endswith('.cfg'):
+                self._cfg_items.append((k, v))
+            self._basename_index[basename(k)] = k
+
+        # Resolved path -> content memo for get_embedded_config_content.
+        self._embedded_content_cache: Dict[str, Optional[str]] = {}
+
+    @cached_property
     def all_definitions(self) -> List[Dict]:
-        if self._all_definitions is None:
-            self._all_definitions = self._load_definitions_from_cfg_files()
-        return self._all_definitions
+        memo_key = self._definitions_cache_key()
+        definitions = _DEFINITIONS_MEMO.get(memo_key)
+        if definitions is None:
+            definitions = self._load_definitions_from_cache()
+            if definitions is None:
+                definitions = self._load_definitions_from_cfg_files()
+                self._save_definitions_to_cache(definitions)
+            _DEFINITIONS_MEMO[memo_key] = definitions
+        return definitions
 
-    @property
-    def parameter_definitions(self) -> Dict[str, List[str]]:
-        if self._parameter_definitions is not None:
-            return self._parameter_definitions
+    @cached_property
+    def by_permname(self) -> Dict[str, Dict]:
+        return {p['permname']: p for p in self.all_definitions}
 
+    @cached_property
+    def polarity_value_map(self) -> Dict[str, str]:
+        return self.by_permname.get("Mode_IonPolarity", {}).get("value_map", {})
+
+    @cached_property
+    def all_definitions_partitioned(self) -> Tuple[List[Dict], List[Dict]]:
+        """The catalog split into (independent, dependent) definitions.
+
+        Dependent definitions are the ones whose value lookup is driven by
+        another parameter; the loader parses them after the independents.
+        """
+        independent, dependent = [], []
+        for p in self.all_definitions:
+            (dependent if p.get('lookup_driven_by') else independent).append(p)
+        return independent, dependent
+
+    def _definitions_cache_key(self) -> str:
+        return hashlib.blake2b(
+            repr(sorted(CONFIG_DATA.keys())).encode() + str(len(CONFIG_DATA)).encode()
+        ).hexdigest()
+
+    def _definitions_cache_path(self) -> str:
+        return os.path.join(USER_CONFIG_DIR, f"defs_cache_{self._definitions_cache_key()}.pkl")
+
+    def _load_definitions_from_cache(self) -> Optional[List[Dict]]:
+        cache_path = self._definitions_cache_path()
+        try:
+            with open(cache_path, 'rb') as f:
+                definitions = pickle.load(f)
+            if isinstance(definitions, list):
+                self.logger.info("Loaded parameter definitions from cache: %s", cache_path)
+                return definitions
+            self.logger.warning("Definitions cache has unexpected content. Re-parsing config files.")
+        except FileNotFoundError:
+            pass
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            self.logger.warning("Could not read definitions cache (%s). Re-parsing config files.", e)
+        return None
+
+    def _save_definitions_to_cache(self, definitions: List[Dict]):
+        cache_path = self._definitions_cache_path()
+        try:
+            os.makedirs(USER_CONFIG_DIR, exist_ok=True)
+            with open(cache_path, 'wb') as f:
+                pickle.dump(definitions, f, protocol=pickle.HIGHEST_PROTOCOL)
+            self.logger.debug("Saved parameter definitions cache to: %s", cache_path)
+        except (OSError, pickle.PicklingError) as e:
+            self.logger.warning("Could not write definitions cache (%s).", e)
+
+    @cached_property
+    def parameter_definitions(self) -> Dict[str, List[str]]:
         if os.path.exists(self.user_view_definitions_path):
-            self.logger.info(f"Loading user-defined view definitions from: {self.user_view_definitions_path}")
+            self.logger.info("Loading user-defined view definitions from: %s", self.user_view_definitions_path)
             try:
-                with open(self.user_view_definitions_path, 'r', encoding='utf-8') as f:
-                    user_defs = json.load(f)
-                
+                with open(self.user_view_definitions_path, 'rb') as f:
+                    user_defs = _json.loads(f.read())
+
                 if isinstance(user_defs, dict) and '__GENERAL__' in user_defs:
-                    self._parameter_definitions = user_defs
-                    return self._parameter_definitions
+                    return user_defs
                 else:
                     self.logger.warning("User view definitions file is malformed. Falling back to default.")
-            except (IOError, json.JSONDecodeError) as e:
-                self.logger.warning(f"User view definitions file is corrupt or unreadable ({e}). Falling back to default.")
+            except (IOError, ValueError) as e:
+                self.logger.warning("User view definitions file is corrupt or unreadable (%s). Falling back to default.", e)
         
         self.logger.info("Loading factory default view definitions.")
         default_defs = self._load_json_from_file("parameter_definitions.json")
         
         if isinstance(default_defs, dict):
-             self._parameter_definitions = default_defs
-        else:
-             self.logger.error("Factory default parameter_definitions.json is not a dict! Using empty config.")
-             self._parameter_definitions = {} 
-             
-        return self._parameter_definitions
+             return default_defs
+
+        self.logger.error("Factory default parameter_definitions.json is not a dict! Using empty config.")
+        return {}
+
+    @cached_property
+    def parameter_definition_sets(self) -> Dict[str, frozenset]:
+        return {workflow: frozenset(permnames) for workflow, permnames in self.parameter_definitions.items()}
+
+    def invalidate_parameter_definitions(self):
+        """Drop the cached view definitions so the next access re-reads them."""
+        self.__dict__.pop('parameter_definitions', None)
+        self.__dict__.pop('parameter_definition_sets', None)
+
+    def preload_in_background(self):
+        """Warm the lazy config properties on a daemon thread.
+
+        The display name map and the license texts are only needed once the
+        first dataset is parsed or the About dialog opens; loading them off
+        the main thread keeps their cost out of the startup path without
+        changing when they become available.
+        """
+        def _warm():
+            try:
+                _ = self.display_name_map
+                _ = self.third_party_licenses
+            except Exception:
+                # The lazy properties handle and report their own errors on
+                # first real access; a failed warm-up must not kill startup.
+                self.logger.debug("Background config preload failed.", exc_info=True)
 
-    @property
+        threading.Thread(target=_warm, name="config-preload", daemon=True).start()
+
+    @cached_property
     def display_name_map(self) -> Dict[str, str]:
-        if self._display_name_map is None:
-            self._display_name_map = self._load_properties_from_config("display_name_map.properties")
-        return self._display_name_map
+        return self._load_properties_from_config("display_name_map.properties")
 
-    @property
+    @cached_property
     def third_party_licenses(self) -> Dict[str, Dict[str, str]]:
-        if self._third_party_licenses is None:
-            self._third_party_licenses = self._load_json_from_file("third_party_licenses.json")
-        return self._third_party_licenses
+        return self._load_json_from_file("third_party_licenses.json")
 
     def get_embedded_config_content(self, relative_path: str) -> Optional[str]:
+        if relative_path in self._embedded_content_cache:
+            return self._embedded_content_cache[relative_path]
+
         normalized_key = relative_path.replace('\\', '/')
         content = CONFIG_DATA.get(normalized_key)
         if content is None:
-             base_name_key = os.path.basename(normalized_key)
-             content = CONFIG_DATA.get(base_name_key)
+             base_name = os.path.basename(normalized_key)
+             content = CONFIG_DATA.get(self._basename_index.get(base_name, ''))
              if content:
-                 self.logger.debug(f"Found embedded content using basename key: {base_name_key}")
+                 self.logger.debug("Found embedded content using basename key: %s", base_name)
              else:
-                 self.logger.warning(f"Embedded config content not found for key '{normalized_key}' or basename '{base_name_key}'.")
+                 self.logger.warning("Embedded config content not found for key '%s' or basename '%s'.", normalized_key, base_name)
         else:
-             self.logger.debug(f"Found embedded content using key: {normalized_key}")
+             self.logger.debug("Found embedded content using key: %s", normalized_key)
+
+        self._embedded_content_cache[relative_path] = content
         return content
 
     def _parse_properties_content(self, content: str) -> Dict[str, str]:
+        # One multiline regex scan over the whole buffer instead of a
+        # Python-level loop over splitlines.
         prop_map = {}
-        pattern = re.compile(r"^\s*([a-zA-Z0-9_]+)\s*=\s*(.*)")
-        
-        for line in content.splitlines():
-            line = line.strip()
-            if not line:
+        for match in _PROPS_RE.finditer(content):
+            key = match.group(1)
+            if key.endswith(_TOOLTIP_SUFFIXES):
                 continue
-
-            match = pattern.match(line)
-            if match:
-                key, value = match.groups()
-                key = key.strip()
-                value = value.strip().encode('latin-1', 'backslashreplace').decode('unicode-escape')
-                if not key.endswith(("_tooltip", "_custom_tooltip")):
-                    prop_map[key] = value       
+            value = match.group(2).rstrip().encode('latin-1', 'backslashreplace').decode('unicode-escape')
+            prop_map[key] = value
         return prop_map
 
     def _parse_valuetext(self, value_text: str) -> Optional[Dict[str, str]]:
         if not value_text: return None
-        value_map = {}
-        try:
-            delimiter, separator = (':', ';') if ';' in value_text else ('|', ',')
-            for pair in value_text.split(separator):
-                if delimiter in pair:
-                    key, value = pair.split(delimiter, 1)
-                    value_map[key.strip()] = value.strip()
-            return value_map if value_map else None
-        except ValueError:
-            self.logger.debug("Could not parse VALUETEXT: %s", value_text)
-            return None
+        pattern = _VT_SEMI if ';' in value_text else _VT_COMMA
+        value_map = dict(pattern.findall(value_text))
+        return value_map if value_map else None
 
     def _load_definitions_from_cfg_files(self) -> List[Dict]:
         self.logger.info("Loading all parameter definitions from embedded config files...")
@@ -146,85 +246,131 @@ class AppConfig:
             "Energy_Ramping_Advanced_Settings_Active": "Advanced Energy Ramping"
         }
 
-        for key, content_string in CONFIG_DATA.items():
-            if not key.lower().endswith('.cfg'):
-                continue
-            
+        # Manual overrides win over the display name map; XML DISPLAYNAME is the fallback.
+        label_overrides = {**display_names, **manual_label_overrides}
+
+        # Local bindings for the per-parameter loop to skip the repeated
+        # global and attribute lookups.
+        dependency_map_get = PARAMETER_DEPENDENCY_MAP.get
+        label_overrides_get = label_overrides.get
+        parse_valuetext = self._parse_valuetext
+        _intern = intern
+
+        parse_errors = []
+
+        for key, content_string in self._cfg_items:
             self.logger.debug("Parsing definitions from: %s", key)
-            
+
             try:
-                xml_root = ET.fromstring(content_string)
-                group_element = xml_root.find(".//GROUP/DISPLAYNAME")
-                group_name = group_element.text.strip() if group_element is not None and group_element.text else "General"
-                
-                param_elements = xml_root.findall(".//VARIABLES/*")
-                if not param_elements:
-                    param_elements = xml_root.findall(".//*[PERMANENTNAME]")
-
-                self.logger.debug("Found %d potential parameter definitions in %s.", len(param_elements), key)
-
-                for param_element in param_elements:
-                    permname_el = param_element.find("PERMANENTNAME")
-                    if permname_el is None or not permname_el.text:
-                        skipped_count += 1
+                stream = io.BytesIO(content_string.encode('utf-8'))
+                group_name = None
+                file_params = []
+                stack = []
+                pending_param_ids = set()
+
+                for event, elem in ET.iterparse(stream, events=('start', 'end')):
+                    if event == 'start':
+                        stack.append(elem)
                         continue
-                    
-                    permname = permname_el.text.strip()
-                    param_def = {"permname": permname, "category": group_name}
-
-                    if permname in PARAMETER_DEPENDENCY_MAP:
-                        param_def["lookup_driven_by"] = PARAMETER_DEPENDENCY_MAP[permname]
-                    
-                    if permname in display_names:
-                        param_def["label"] = display_names[permname]
-                    else:
-                        label_el = param_element.find("DISPLAYNAME")
-                        param_def["label"] = label_el.text.strip() if label_el is not None and label_el.text else permname
-                    
-                    if permname in manual_label_overrides:
-                        param_def["label"] = manual_label_overrides[permname]
-
-                    unit_el = param_element.find("UNIT")
-                    if unit_el is not None and unit_el.text: param_def["unit"] = unit_el.text.strip()
-                    
-                    vf_el = param_element.find("VALUEFORMAT")
+                    stack.pop()
+
+                    # A PERMANENTNAME child marks its parent as a parameter element.
+                    if elem.tag == 'PERMANENTNAME':
+                        if stack:
+                            if elem.text and elem.text.strip():
+                                pending_param_ids.add(id(stack[-1]))
+                            else:
+                                skipped_count += 1
+                        continue
+
+                    if elem.tag == 'DISPLAYNAME':
+                        if group_name is None and stack and stack[-1].tag == 'GROUP' and elem.text:
+                            group_name = elem.text.strip()
+                        continue
+
+                    if id(elem) not in pending_param_ids:
+                        continue
+                    pending_param_ids.discard(id(elem))
+
+                    kids = {child.tag: child for child in elem}
+
+                    permname = _intern(kids["PERMANENTNAME"].text.strip())
+                    param_def = {"permname": permname}
+
+                    lookup = dependency_map_get(permname)
+                    if lookup is not None:
+                        param_def["lookup_driven_by"] = lookup
+
+                    label = label_overrides_get(permname)
+                    if label is None:
+                        label_el = kids.get("DISPLAYNAME")
+                        label = label_el.text.strip() if label_el is not None and label_el.text else permname
+                    param_def["label"] = _intern(label)
+
+                    unit_el = kids.get("UNIT")
+                    if unit_el is not None and unit_el.text: param_def["unit"] = _intern(unit_el.text.strip())
+
+                    vf_el = kids.get("VALUEFORMAT")
                     if vf_el is not None and vf_el.text:
-                        match = re.search(r'%\.(\d+)f', vf_el.text)
-                        if match: param_def["round_to"] = int(match.group(1))
-                    
-                    dep_el = param_element.find("DEPENDENCY")
+                        vf_text = vf_el.text
+                        start = vf_text.find('%.')
+                        if start != -1:
+                            end = vf_text.find('f', start + 2)
+                            if end != -1 and vf_text[start + 2:end].isdigit():
+                                param_def["round_to"] = int(vf_text[start + 2:end])
+
+                    dep_el = kids.get("DEPENDENCY")
                     if dep_el is not None and dep_el.text and 'P' in dep_el.text: param_def["is_polarity_dependent"] = True
-                    
-                    use_el = param_element.find("USE")
-                    if use_el is not None and use_el.text: param_def["location"] = use_el.text.strip()
-                    
-                    valuetext_el = param_element.find("VALUETEXT")
-                    if valuetext_el is not None and valuetext_el.text: param_def["value_map"] = self._parse_valuetext(valuetext_el.text)
-                    
-                    type_el = param_element.find("TYPE")
+
+                    use_el = kids.get("USE")
+                    if use_el is not None and use_el.text: param_def["location"] = _intern(use_el.text.strip())
+
+                    valuetext_el = kids.get("VALUETEXT")
+                    if valuetext_el is not None and valuetext_el.text: param_def["value_map"] = parse_valuetext(valuetext_el.text)
+
+                    type_el = kids.get("TYPE")
                     if type_el is not None and type_el.text and type_el.text.strip().lower() == 'bool':
                         param_def["type"] = "boolean"
 
-                    all_params.append(param_def)
+                    file_params.append(param_def)
                     loaded_count += 1
+                    elem.clear()
+
+                # The group name may appear after the parameters in document
+                # order, so the category is applied once the file is parsed.
+                category = _intern(group_name) if group_name else "General"
+                for param_def in file_params:
+                    param_def["category"] = category
+                all_params.extend(file_params)
 
-            except ET.ParseError as e:
+                self.logger.debug("Found %d parameter definitions in %s.", len(file_params), key)
+
+            except _XML_PARSE_ERROR as e:
                 self.logger.error("XML parsing error in embedded file %s: %s", key, e)
-                messagebox.showerror("Configuration Error", f"Error parsing embedded XML from: {key}\n\n{e}")
-        
+                parse_errors.append((key, str(e)))
+
+        # One aggregated dialog after the loop instead of a modal stall per
+        # malformed file; the parse of the remaining files is not held up.
+        if parse_errors:
+            details = "\n".join(f"{key}: {error}" for key, error in parse_errors)
+            messagebox.showerror("Configuration Error", f"Error parsing embedded XML from:\n\n{details}")
+
         self.logger.info("Parameter definition loading complete. Loaded: %d, Skipped: %d", loaded_count, skipped_count)
-        all_params.sort(key=lambda x: x.get('label', x.get('permname', '')))
-        return all_params
+        # Decorate-sort-undecorate: compute the sort key once per entry
+        # instead of twice per comparison inside the key lambda.
+        keyed = [(p.get('label') or p.get('permname') or '', p) for p in all_params]
+        keyed.sort(key=itemgetter(0))
+        return [p for _, p in keyed]
 
     def _load_json_from_file(self, file_name: str) -> Dict[str, Any]:
         json_string = self.get_embedded_config_content(file_name)
         if not json_string:
-            self.logger.error(f"Failed to load embedded JSON content for: {file_name}")
+            self.logger.error("Failed to load embedded JSON content for: %s", file_name)
             messagebox.showerror("Configuration Error", f"Could not load embedded file: {file_name}")
             return {}
         try:
-            return json.loads(json_string)
-        except json.JSONDecodeError as e:
+            return _json.loads(json_string.encode('utf-8') if isinstance(json_string, str) else json_string)
+        except ValueError as e:
             self.logger.error("Failed to parse embedded JSON %s: %s", file_name, e)
             messagebox.showerror("Configuration Error", f"Could not parse embedded file: {file_name}\n\nDetails: {e}")
             return {} 
@@ -232,7 +378,7 @@ class AppConfig:
     def _load_properties_from_config(self, file_name: str) -> Dict[str, str]:
         content_string = self.get_embedded_config_content(file_name)
         if not content_string:
-            self.logger.warning(f"Embedded properties file not found: {file_name}. Using defaults.")
+            self.logger.warning("Embedded properties file not found: %s. Using defaults.", file_name)
             return {}
         try:
             return self._parse_properties_content(content_string)
@@ -240,21 +386,7 @@ class AppConfig:
             self.logger.error("Failed to load or parse embedded properties file %s: %s", file_name, e)
             messagebox.showerror("Configuration Error", f"Could not load or parse embedded properties file: {file_name}\n\nDetails: {e}")
             return {}
-            
-    def get_embedded_config_content(self, relative_path: str) -> Optional[str]:
-        normalized_key = relative_path.replace('\\', '/')
-        content = CONFIG_DATA.get(normalized_key)
-        if content is None:
-             base_name_key = os.path.basename(normalized_key)
-             content = CONFIG_DATA.get(base_name_key)
-             if content:
-                 self.logger.debug(f"Found embedded content using basename key: {base_name_key}")
-             else:
-                 self.logger.warning(f"Embedded config content not found for key '{normalized_key}' or basename '{base_name_key}'.")
-        else:
-             self.logger.debug(f"Found embedded content using key: {normalized_key}")
-        return content
-    
+
     def get_factory_default_views(self) -> Dict[str, List[str]]:
         self.logger.info("Loading factory default view definitions directly.")
         
@@ -264,4 +396,10 @@ class AppConfig:
              return default_defs
         else:
              self.logger.error("Factory default parameter_definitions.json is not a dict! Using empty config.")
-             return {}
\ No newline at end of file
+             return {}
+
+
+@lru_cache(maxsize=1)
+def get_app_config() -> AppConfig:
+    """Return the process-wide AppConfig instance, creating it on first use."""
+    return AppConfig()
\ No newline at end of file
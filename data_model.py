@@ -5,6 +5,11 @@ from typing import Optional, Any, Dict, List, Tuple
 import xml.etree.ElementTree as ET
 
 class Segment:
+    __slots__ = ('start_time', 'end_time', 'end_time_display', 'is_calibration_segment',
+                 'workflow_name', 'scan_mode_id', 'parameters', 'ion_polarity',
+                 'dia_windows_data', 'diagonal_pasef_data', 'pasef_polygon_data',
+                 'xml_scope_element')
+
     def __init__(self, start_time: float, end_time: float):
         self.start_time: float = start_time
         self.end_time: float = end_time
@@ -14,6 +19,7 @@ class Segment:
         self.workflow_name: Optional[str] = None
         self.scan_mode_id: Optional[int] = None 
         self.parameters: Dict[str, Any] = {}
+        self.ion_polarity: str = "unknown"
         
         self.dia_windows_data: Optional[pd.DataFrame] = None
         self.diagonal_pasef_data: Optional[pd.DataFrame] = None
@@ -21,6 +27,12 @@ class Segment:
         self.xml_scope_element: Optional[ET.Element] = None
 
 class Dataset:
+    __slots__ = ('key_path', 'display_name', 'method_file_path', 'sqlite_path',
+                 'segments', 'active_segment_index', '_is_plotted_var',
+                 'instrument_model', 'tims_control_version', 'last_modified_date',
+                 'default_params', 'available_optional_params', 'user_added_params',
+                 'xml_root', 'available_sources')
+
     def __init__(self, key_path: str):
         self.key_path: str = key_path
         self.display_name: str = os.path.basename(key_path)
@@ -28,7 +40,7 @@ class Dataset:
         self.sqlite_path: Optional[str] = None
         self.segments: List[Segment] = []
         self.active_segment_index: int = 0
-        self.is_plotted_var = tk.BooleanVar(value=True)
+        self._is_plotted_var: Optional[tk.BooleanVar] = None
 
         self.instrument_model: Optional[str] = None
         self.tims_control_version: Optional[str] = None
@@ -39,10 +51,19 @@ class Dataset:
         self.user_added_params: List[Dict] = [] 
         self.xml_root: Optional[ET.Element] = None
         self.available_sources: List[str] = []
-        
+
+    @property
+    def is_plotted_var(self) -> tk.BooleanVar:
+        # Created on first access so Dataset construction stays pure Python:
+        # a BooleanVar needs a Tk root and costs a Tcl round-trip, which
+        # also makes it unsafe to build datasets on a worker thread.
+        if self._is_plotted_var is None:
+            self._is_plotted_var = tk.BooleanVar(value=True)
+        return self._is_plotted_var
+
     def get_parameter_value(self, permname: str) -> Any:
-        try:
-            active_segment = self.segments[self.active_segment_index]
-            return active_segment.parameters.get(permname)
-        except IndexError:
-            return None
\ No newline at end of file
+        segments = self.segments
+        index = self.active_segment_index
+        if 0 <= index < len(segments):
+            return segments[index].parameters.get(permname)
+        return None
\ No newline at end of file
@@ -6,6 +6,11 @@ from logging.handlers import RotatingFileHandler
 from settings import ENABLE_DEBUG_LOGGING
 
 def setup_logging() -> str | None:
+    # Idempotent: a second call (GUI restart, tests) must not re-stat and
+    # reopen the log file or stack duplicate handlers.
+    if getattr(setup_logging, '_configured', False):
+        return None
+
     log_level = logging.DEBUG if ENABLE_DEBUG_LOGGING else logging.INFO
     
     log_formatter = logging.Formatter(
@@ -19,8 +24,9 @@ def setup_logging() -> str | None:
     logging.getLogger("matplotlib").setLevel(logging.WARNING)
     logging.getLogger("PIL").setLevel(logging.WARNING)
     
-    if logger.hasHandlers():
-        logger.handlers.clear()
+    # Only drop handlers this module installed; leave test harness or
+    # embedder handlers alone.
+    logger.handlers = [h for h in logger.handlers if not getattr(h, '_timscompare', False)]
 
     try:
         log_dir = os.path.join(os.path.expanduser('~'), '.timsCompare')
@@ -29,11 +35,14 @@ def setup_logging() -> str | None:
         
         file_handler = RotatingFileHandler(log_file, maxBytes=5*1024*1024, backupCount=5, encoding='utf-8')
         file_handler.setFormatter(log_formatter)
+        file_handler._timscompare = True
         logger.addHandler(file_handler)
     except (IOError, PermissionError) as e:
         console_handler = logging.StreamHandler()
         console_handler.setFormatter(log_formatter)
+        console_handler._timscompare = True
         logger.addHandler(console_handler)
+        setup_logging._configured = True
         
         error_message = (f"Could not create log file at:\n{log_file}\n\n"
                          f"Reason: {e}\n\n"
@@ -43,7 +52,9 @@ def setup_logging() -> str | None:
 
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(log_formatter)
+    console_handler._timscompare = True
     logger.addHandler(console_handler)
-    
+    setup_logging._configured = True
+
     logging.info("Logging configured successfully. Application log level: %s", logging.getLevelName(log_level))
     return None
\ No newline at end of file
@@ -5,7 +5,6 @@ import logging
 import tkinter as tk
 import customtkinter as ctk
 from tkinterdnd2 import TkinterDnD
-from PIL import Image, ImageTk
 import sys
 import ctypes
 
@@ -22,7 +21,7 @@ logging.getLogger("PIL").setLevel(logging.WARNING)
 early_logger.info(">>> main.py: Starting execution <<<")
 
 from utils import resource_path
-from app_config import AppConfig
+from app_config import get_app_config
 from services import DataLoaderService, PlottingService, ReportGeneratorService
 from ui.main_window import timsCompareApp
 from logger_setup import setup_logging
@@ -30,17 +29,20 @@ from settings import LOGGING_ENABLED
 
 early_logger.debug(">>> main.py: Imports successful <<<")
 
-if sys.platform == 'win32':
-    ctypes.windll.shcore.SetProcessDpiAwareness(1)
-
 class DndCTk(ctk.CTk, TkinterDnD.DnDWrapper):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.TkdndVersion = TkinterDnD._require(self)
 
 
-if __name__ == "__main__":
-    early_logger.debug(">>> main.py: Inside __main__ block <<<")
+def main():
+    """Single entry point: configure logging, build services, run the app."""
+    early_logger.debug(">>> main.py: Inside main() <<<")
+    # Must run before the first window handle is created, but only in the
+    # process that actually shows UI — not on a bare import of this module.
+    if sys.platform == 'win32':
+        ctypes.windll.shcore.SetProcessDpiAwareness(1)
+
     if LOGGING_ENABLED:
         from tkinter import messagebox
         log_setup_error = setup_logging()
@@ -49,14 +51,18 @@ if __name__ == "__main__":
             temp_root.withdraw()
             messagebox.showwarning("Logging Issue", log_setup_error, parent=temp_root)
             temp_root.destroy()
-        else:
-            logging.basicConfig(level=logging.WARNING)
+        if not log_setup_error:
+            # setup_logging installed its own console handler on the root
+            # logger; drop the bootstrap one so every record is not
+            # formatted and written twice for the rest of the session.
+            early_logger.removeHandler(console_handler)
 
 
     logger = logging.getLogger(__name__)
     logger.info("timsCompare starting...")
     logger.debug(">>> main.py: Creating AppConfig <<<")
-    config = AppConfig()
+    config = get_app_config()
+    config.preload_in_background()
     logger.debug(">>> main.py: Setting appearance mode <<<")
 
     ctk.set_appearance_mode("dark")
@@ -73,11 +79,13 @@ if __name__ == "__main__":
 
         logger.debug(f"Looking for theme file at: {theme_file_path}")
 
-        if os.path.exists(theme_file_path):
+        # Let the load fail instead of stat-ing the file first; one syscall
+        # less on the startup path and the fallback is identical.
+        try:
             ctk.set_default_color_theme(theme_file_path)
             logger.info(f"Successfully loaded theme file: {theme_file_path}")
-        else:
-            logger.warning(f"Theme file not found at '{theme_file_path}'. Using default 'blue' theme.")
+        except (OSError, ValueError):
+            logger.warning(f"Theme file not usable at '{theme_file_path}'. Using default 'blue' theme.")
             ctk.set_default_color_theme("blue")
     except Exception as e:
         logger.error(f"Failed during theme file loading: {e}. Using default 'blue' theme.", exc_info=True)
@@ -85,7 +93,10 @@ if __name__ == "__main__":
         
     logger.debug(">>> main.py: Creating DndCTk root window <<<")
     root = DndCTk()
-    
+    # Keep the window hidden while the widget tree is built so Tk performs
+    # one layout pass at the end instead of redrawing per widget.
+    root.withdraw()
+
     logger.debug(">>> main.py: Creating services <<<")
     data_loader = DataLoaderService(config)
     plot_service = PlottingService()
@@ -97,19 +108,28 @@ if __name__ == "__main__":
     
     try:
         icon_path_assets = resource_path('assets/icon.ico')
-        if os.path.exists(icon_path_assets):
-             root.iconbitmap(icon_path_assets)
-             logger.debug(f"Set icon from assets: {icon_path_assets}")
-        else: 
-             icon_path_root = os.path.join(base_path, 'icon.ico')
-             if os.path.exists(icon_path_root):
-                  root.iconbitmap(icon_path_root)
-                  logger.debug(f"Set icon from root: {icon_path_root}")
-             else:
-                  logger.warning(f"Icon file not found at '{icon_path_assets}' or '{icon_path_root}'")
+        try:
+            root.iconbitmap(icon_path_assets)
+            logger.debug(f"Set icon from assets: {icon_path_assets}")
+        except tk.TclError:
+            icon_path_root = os.path.join(base_path, 'icon.ico')
+            try:
+                root.iconbitmap(icon_path_root)
+                logger.debug(f"Set icon from root: {icon_path_root}")
+            except tk.TclError:
+                logger.warning(f"Icon file not found at '{icon_path_assets}' or '{icon_path_root}'")
     except Exception as e:
         logger.warning(f"Failed to set window icon: {e}")
     
+    root.update_idletasks()
+    root.deiconify()
+
     logger.debug(">>> main.py: Starting mainloop <<<")
     root.mainloop()
-    logger.debug(">>> main.py: Mainloop finished <<<")
\ No newline at end of file
+    logger.debug(">>> main.py: Mainloop finished <<<")
+
+
+if __name__ == "__main__":
+    from multiprocessing import freeze_support
+    freeze_support()
+    main()
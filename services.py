@@ -3,7 +3,18 @@
 import os
 import json
 import sqlite3
-import xml.etree.ElementTree as ET
+
+try:
+    import orjson as _json
+except ImportError:
+    _json = json
+
+try:
+    from lxml import etree as ET
+    _XML_PARSE_ERROR = ET.XMLSyntaxError
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _XML_PARSE_ERROR = ET.ParseError
 import io
 import logging
 import pandas as pd
@@ -13,11 +24,13 @@ import matplotlib
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+from matplotlib.collections import PatchCollection, PolyCollection
 
 from PIL import Image
 import customtkinter as ctk
 from typing import Optional, Any, List, Dict, Tuple, Callable
-from collections import defaultdict
+from collections import defaultdict, deque
+from functools import lru_cache
 from fpdf import FPDF
 import tempfile
 
@@ -38,7 +51,11 @@ INSTRUMENT_KEY_MAP = {
     "0x7022": "timsMetabo"
 }
 
-class DataProcessingError(Exception): 
+# Maps an imeX mode driver value to the entry index it selects in a
+# lookup-driven parameter list.
+_IMEX_MODE_IDX = {'0': 0, '1': 1, '2': 2, '3': 3, '4': 4}
+
+class DataProcessingError(Exception):
     pass
 class MethodFileNotFoundError(DataProcessingError): 
     pass
@@ -48,10 +65,36 @@ class ParsingError(DataProcessingError):
     pass
 
 
-class DataLoaderService: 
+class DataLoaderService:
+    __slots__ = ('config', '_find_cache', '_scope_index_cache', '_source_value_cache', 'logger')
+
+    # Every derived key a calculation pass can write; popping these directly
+    # avoids scanning and copying the whole parameter dict on each reload.
+    _CALC_KEYS = (
+        "calc_scan_mode",
+        "calc_segment_start_time",
+        "calc_segment_end_time",
+        "calc_advanced_ce_ramping_display_list",
+        "calc_ce_ramping_start",
+        "calc_ce_ramping_end",
+        "calc_msms_stepping_display_list",
+        "calc_cycle_time",
+        "calc_ms1_scans",
+        "calc_ramps",
+        "calc_steps",
+        "calc_mz_width",
+        "calc_scan_area_mz",
+        "calc_scan_area_im",
+        "calc_im_start",
+        "calc_im_end",
+    )
+    _CALC_KEYS_SET = frozenset(_CALC_KEYS)
+
     def __init__(self, config: AppConfig): 
         self.config = config 
-        self._find_cache = {} 
+        self._find_cache = {}
+        self._scope_index_cache = {}
+        self._source_value_cache = {}
         self.logger = logging.getLogger(__name__) 
 
     def get_default_parameters_for_dataset(self, dataset: Dataset) -> List[Dict]: 
@@ -61,35 +104,36 @@ class DataLoaderService:
         if not datasets:
             return []
 
-        has_multisegment_file = any(len(ds.segments) > 1 for ds in datasets)
-        has_advanced_ce = any(s.parameters.get("Energy_Ramping_Advanced_Settings_Active") == '1' for ds in datasets for s in ds.segments)
-        has_standard_ce = any(s.parameters.get("Energy_Ramping_Advanced_Settings_Active") != '1' for ds in datasets for s in ds.segments)
-        has_icc_mode1 = any(s.parameters.get("IMSICC_Mode") == '1' for ds in datasets for s in ds.segments)
-        has_icc_mode2 = any(s.parameters.get("IMSICC_Mode") == '2' for ds in datasets for s in ds.segments)
-        has_msms_stepping = any(s.parameters.get("Ims_Stepping_Active") == '1' for ds in datasets for s in ds.segments)
+        # One pass over every segment instead of six independent any() scans.
+        has_multisegment_file = has_advanced_ce = has_standard_ce = False
+        has_icc_mode1 = has_icc_mode2 = has_msms_stepping = False
+        for ds in datasets:
+            if len(ds.segments) > 1:
+                has_multisegment_file = True
+            for s in ds.segments:
+                params = s.parameters
+                advanced_active = params.get("Energy_Ramping_Advanced_Settings_Active")
+                has_advanced_ce |= advanced_active == '1'
+                has_standard_ce |= advanced_active != '1'
+                icc_mode = params.get("IMSICC_Mode")
+                has_icc_mode1 |= icc_mode == '1'
+                has_icc_mode2 |= icc_mode == '2'
+                has_msms_stepping |= params.get("Ims_Stepping_Active") == '1'
 
         all_workflows_in_dataset = {s.workflow_name for ds in datasets for s in ds.segments if s.workflow_name}
         default_params_by_workflow = self.config.parameter_definitions
 
-        default_permnames_ordered = []
-        seen_permnames = set()
+        # dicts preserve insertion order, so one serves as ordered set here.
+        ordered_permnames: Dict[str, None] = dict.fromkeys(default_params_by_workflow.get('__GENERAL__') or [])
+        for wf in sorted(all_workflows_in_dataset):
+            ordered_permnames.update(dict.fromkeys(default_params_by_workflow.get(wf) or []))
 
-        def add_unique(permnames):
-            if permnames:
-                for pname in permnames:
-                    if pname not in seen_permnames:
-                        seen_permnames.add(pname)
-                        default_permnames_ordered.append(pname)
+        if "calc_scan_mode" in ordered_permnames:
+            ordered_permnames.pop("Mode_ScanMode", None)
 
-        add_unique(default_params_by_workflow.get('__GENERAL__', []))
-        for wf in sorted(list(all_workflows_in_dataset)):
-            add_unique(default_params_by_workflow.get(wf, []))
+        default_permnames_ordered = list(ordered_permnames)
 
-        if "calc_scan_mode" in seen_permnames and "Mode_ScanMode" in seen_permnames:
-            if "Mode_ScanMode" in default_permnames_ordered:
-                 default_permnames_ordered.remove("Mode_ScanMode")
-
-        all_definitions_map = {p['permname']: p for p in self.config.all_definitions}
+        all_definitions_map = self.config.by_permname
         default_param_configs = []
 
         for pname in default_permnames_ordered:
@@ -145,6 +189,22 @@ class DataLoaderService:
 
         return final_params
 
+    def _permname_index(self, scope_element: ET.Element) -> Dict[str, ET.Element]: 
+        """Map permname -> first matching element below scope_element. 
+
+        Built in a single iter() pass and cached per scope for the current 
+        dataset load, replacing one full-tree find() walk per parameter. 
+        """ 
+        index = self._scope_index_cache.get(scope_element) 
+        if index is None: 
+            index = {} 
+            for el in scope_element.iter(): 
+                permname = el.get('permname') 
+                if permname is not None and permname not in index: 
+                    index[permname] = el 
+            self._scope_index_cache[scope_element] = index 
+        return index 
+
     def _discover_available_parameters(self, xml_root: ET.Element) -> Tuple[List[Dict], List[Dict]]: 
         all_definitions = self.config.all_definitions 
         
@@ -156,29 +216,39 @@ class DataLoaderService:
         available_defaults = [p for p in all_definitions if p['permname'] in default_param_permnames] 
         
         available_optionals = [] 
-        optional_definitions = [p for p in all_definitions if p['permname'] not in default_param_permnames] 
+        found_in_method = self._permname_index(xml_root) 
         
         found_optional_permnames = set() 
-        for param_config in optional_definitions: 
+        for param_config in all_definitions: 
             permname = param_config['permname'] 
-            if xml_root.find(f".//*[@permname='{permname}']") is not None: 
+            if permname not in default_param_permnames and permname in found_in_method: 
                 if permname not in found_optional_permnames: 
                     available_optionals.append(param_config) 
                     found_optional_permnames.add(permname) 
         return available_defaults, available_optionals 
     
     def _discover_available_sources(self, xml_root: ET.Element) -> List[str]:
+        # Collect the ion sources and seed the root permname index in the
+        # same walk, so parameter discovery right after this reuses it.
         found_sources = set()
-        for dep_element in xml_root.iter('dependent'):
-            source_attr = dep_element.get('source')
-            if source_attr:
-                found_sources.add(source_attr)
-        
-        return sorted(list(found_sources))
+        index = {}
+        for elem in xml_root.iter():
+            permname = elem.get('permname')
+            if permname is not None and permname not in index:
+                index[permname] = elem
+            if elem.tag == 'dependent':
+                source_attr = elem.get('source')
+                if source_attr:
+                    found_sources.add(source_attr)
+        self._scope_index_cache[xml_root] = index
+
+        return sorted(found_sources)
 
     def load_dataset_from_folder(self, folder_path: str) -> Dataset:
         self.logger.info(f"Attempting to load dataset from: {folder_path}")
         self._find_cache.clear()
+        self._scope_index_cache.clear()
+        self._source_value_cache.clear()
         dataset = Dataset(key_path=folder_path)
         method_file = self._find_file(folder_path, ["microtofqimpactemacquisition.method"])
         if not method_file:
@@ -191,11 +261,15 @@ class DataLoaderService:
             tree = ET.parse(method_file, parser=ET.XMLParser(encoding="iso-8859-1"))
             root = tree.getroot()
             dataset.xml_root = root
-        except ET.ParseError as e:
+        except _XML_PARSE_ERROR as e:
             error_msg = f"Failed to parse XML in {os.path.basename(method_file)}: {e}"
             self.logger.error(error_msg, exc_info=True)
             raise ParsingError(error_msg)
 
+        method_element = root.find('method')
+        if method_element is None:
+            raise ParsingError("Could not find the <method> tag in the file.")
+
         general_info_element = root.find('./generalinfo')
         if general_info_element is not None:
             config_element = general_info_element.find('configuration')
@@ -260,27 +334,21 @@ class DataLoaderService:
         dataset.default_params = default_params
         dataset.available_optional_params = optional_params
 
-        all_defs_map = {p['permname']: p for p in self.config.all_definitions}
+        all_defs_map = self.config.by_permname
         scan_mode_map = all_defs_map.get("Mode_ScanMode", {}).get("value_map", {})
-        polarity_map = all_defs_map.get("Mode_IonPolarity", {}).get("value_map", {})
+        polarity_map = self.config.polarity_value_map
         segment_elements = root.findall('./method/qtofimpactemacq/timetable/segment')
         instrument_element = root.find('instrument')
 
         if not segment_elements:
             new_segment = Segment(start_time=0.0, end_time=-1.0)
             new_segment.end_time_display = "N/A"
-            method_element = root.find('method')
-            if method_element is None: raise ParsingError("Could not find the <method> tag in the file.")
-            
             self._parse_and_populate_segment(new_segment, method_element, method_element, instrument_element, scan_mode_map, polarity_map, folder_path, {})
             dataset.segments.append(new_segment)
         else:
             last_end_time = 0.0
 
-            method_element = root.find('method')
-            if method_element is None: raise ParsingError("Could not find the <method> tag in the file.")
-
-            global_polarity_el = method_element.find(f".//*[@permname='Mode_IonPolarity']")
+            global_polarity_el = self._permname_index(method_element).get('Mode_IonPolarity')
             global_polarity_val = self._get_value_from_element(global_polarity_el, {}) or '0'
             global_polarity_str = polarity_map.get(str(global_polarity_val))
 
@@ -354,7 +422,7 @@ class DataLoaderService:
         
         unfiltered_params = previous_params.copy()
         
-        current_polarity_el = segment_scope_element.find(f".//*[@permname='Mode_IonPolarity']")
+        current_polarity_el = self._permname_index(segment_scope_element).get('Mode_IonPolarity')
         current_polarity_val = self._get_value_from_element(current_polarity_el, {})
         
         final_polarity_raw_val = current_polarity_val if current_polarity_val is not None else unfiltered_params.get("Mode_IonPolarity")
@@ -385,23 +453,23 @@ class DataLoaderService:
         )
         unfiltered_params.update(segment_values) 
         
-        all_defs_map = {p['permname']: p for p in self.config.all_definitions}
-        ime_x_mode_to_index = {'0': 0, '1': 1, '2': 2, '3': 3, '4': 4}
-        
-        for permname, value in list(unfiltered_params.items()):
-            if isinstance(value, list):
-                param_config = all_defs_map.get(permname)
-                if param_config:
-                    driver_permname = param_config.get("lookup_driven_by")
-                    if driver_permname:
-                        driver_value = unfiltered_params.get(driver_permname)
-                        if driver_value is not None:
-                            try:
-                                index = ime_x_mode_to_index.get(str(driver_value))
-                                if index is not None and index < len(value):
-                                    unfiltered_params[permname] = value[index]
-                            except (ValueError, IndexError):
-                                self.logger.warning(f"Could not resolve dependent parameter {permname} using driver {driver_permname} with value {driver_value}.")
+        # Only lookup-driven definitions can need re-indexing here, so walk
+        # the precomputed dependent partition instead of every parsed value.
+        _, dependent_defs = self.config.all_definitions_partitioned
+        for param_config in dependent_defs:
+            permname = param_config['permname']
+            value = unfiltered_params.get(permname)
+            if not isinstance(value, list):
+                continue
+            driver_permname = param_config.get("lookup_driven_by")
+            driver_value = unfiltered_params.get(driver_permname)
+            if driver_value is not None:
+                try:
+                    index = _IMEX_MODE_IDX.get(str(driver_value))
+                    if index is not None and index < len(value):
+                        unfiltered_params[permname] = value[index]
+                except (ValueError, IndexError):
+                    self.logger.warning(f"Could not resolve dependent parameter {permname} using driver {driver_permname} with value {driver_value}.")
         
         scan_mode_val = unfiltered_params.get("Mode_ScanMode")
         workflow_name = scan_mode_map.get(str(scan_mode_val))
@@ -421,16 +489,14 @@ class DataLoaderService:
         self._perform_calculations(new_segment, folder_path, polarity_map)
         self._apply_conditional_logic(new_segment)
         
-        allowed_permnames = set(self.config.parameter_definitions.get('__GENERAL__', []))
-        workflow_specific_params = self.config.parameter_definitions.get(workflow_name, [])
-        allowed_permnames.update(workflow_specific_params)
-
-        filtered_params = {}
-        for permname, value in new_segment.parameters.items():
-            if permname in allowed_permnames or permname.startswith("calc_"):
-                filtered_params[permname] = value
-        
-        new_segment.parameters = filtered_params
+        definition_sets = self.config.parameter_definition_sets
+        allowed_permnames = definition_sets.get('__GENERAL__', frozenset()) | definition_sets.get(workflow_name, frozenset())
+
+        # Resolve the kept keys with set algebra, then copy in document order.
+        unfiltered = new_segment.parameters
+        kept_keys = unfiltered.keys() & allowed_permnames
+        kept_keys |= unfiltered.keys() & self._CALC_KEYS_SET
+        new_segment.parameters = {k: v for k, v in unfiltered.items() if k in kept_keys}
         
         calibration_value = unfiltered_params.get("Calibration_MarkSegment")
         if calibration_value == "1":
@@ -439,9 +505,8 @@ class DataLoaderService:
         return unfiltered_params
 
     def _perform_calculations(self, segment: Segment, folder_path: str, polarity_map: Dict): 
-        for key in list(segment.parameters.keys()): 
-            if key.startswith("calc_"): 
-                del segment.parameters[key] 
+        for key in self._CALC_KEYS:
+            segment.parameters.pop(key, None)
 
         segment.parameters["calc_scan_mode"] = segment.workflow_name 
         final_polarity_val = segment.parameters.get("Mode_IonPolarity") 
@@ -459,37 +524,33 @@ class DataLoaderService:
         elif segment.scan_mode_id == 11: # diagonal-PASEF
             self._process_diagonal_pasef_data(segment, folder_path) 
 
-    def _apply_conditional_logic(self, segment: Segment): 
-        duty_cycle_lock = segment.parameters.get("IMS_imeX_DutyCycleLock") 
-        if duty_cycle_lock == "1": 
-            ramp_time_value = segment.parameters.get("IMS_imeX_RampTime") 
-            if ramp_time_value is not None: 
-                segment.parameters["IMS_imeX_AccumulationTime"] = ramp_time_value 
+    def _apply_conditional_logic(self, segment: Segment):
+        params = segment.parameters
+        if params.get("IMS_imeX_DutyCycleLock") == "1":
+            if (ramp_time_value := params.get("IMS_imeX_RampTime")) is not None:
+                params["IMS_imeX_AccumulationTime"] = ramp_time_value
 
-        icc_mode = segment.parameters.get("IMSICC_Mode")
+        icc_mode = params.get("IMSICC_Mode")
         if icc_mode and icc_mode != '0':
-            if "IMS_imeX_AccumulationTime" in segment.parameters:
-                segment.parameters["IMS_imeX_AccumulationTime"] = "variable"
-            if "IMS_imeX_DutyCycleLock" in segment.parameters:
-                segment.parameters["IMS_imeX_DutyCycleLock"] = "variable"
-            if "calc_cycle_time" in segment.parameters:
-                segment.parameters["calc_cycle_time"] = "variable"
+            for key in ("IMS_imeX_AccumulationTime", "IMS_imeX_DutyCycleLock", "calc_cycle_time"):
+                if key in params:
+                    params[key] = "variable"
 
     def _get_value_from_element(self, element: Optional[ET.Element], config: Dict) -> Optional[Any]: 
         if element is None: 
             return None 
-        entry_index = config.get("entry_index") 
-        if entry_index is not None: 
-            try: 
-                return list(element)[int(entry_index)].get('value') 
-            except (IndexError, TypeError, ValueError): 
-                return None 
-        if len(list(element)) > 0: 
-            if list(element)[0].get('value') is not None: 
-                 return [entry.get('value') for entry in element] 
-            else: 
-                 return [entry.text for entry in element] 
-        return element.attrib.get("value") 
+        entry_index = config.get("entry_index")
+        if entry_index is not None:
+            try:
+                return element[int(entry_index)].get('value')
+            except (IndexError, TypeError, ValueError):
+                return None
+        if len(element) > 0:
+            if element[0].get('value') is not None:
+                 return [entry.get('value') for entry in element]
+            else:
+                 return [entry.text for entry in element]
+        return element.attrib.get("value")
 
     def _parse_parameters_for_scope(self, 
                                      param_scope_element: ET.Element, 
@@ -498,8 +559,35 @@ class DataLoaderService:
                                      ion_polarity: Optional[str], 
                                      ion_source: Optional[str] = None) -> Dict:
         results = {}
-        all_param_defs_map = {p['permname']: p for p in self.config.all_definitions}
-        ime_x_mode_to_index = {'0': 0, '1': 1, '2': 2, '3': 3, '4': 4}
+        all_param_defs_map = self.config.by_permname
+
+        # The ranked <dependent> scopes only depend on the search root and the
+        # polarity/source of this call, so they are computed once here instead
+        # of once per parameter inside the lookup closure.
+        ranked_scope_cache = {}
+
+        def ranked_dependent_indexes(search_root) -> List[Dict]:
+            ranked = ranked_scope_cache.get(search_root)
+            if ranked is None:
+                dependent_scopes = []
+                for dep_element in search_root.iter('dependent'):
+                    pol_attr = dep_element.get('polarity')
+                    src_attr = dep_element.get('source')
+
+                    src_match = (src_attr and ion_source and src_attr.lower() == ion_source.lower())
+                    pol_match = (pol_attr and ion_polarity and pol_attr.lower() == ion_polarity.lower())
+
+                    if pol_match and src_match:
+                        dependent_scopes.insert(0, (3, dep_element))
+                    elif pol_match:
+                        dependent_scopes.append((2, dep_element))
+                    elif src_match:
+                        dependent_scopes.append((1, dep_element))
+
+                dependent_scopes.sort(key=lambda x: x[0], reverse=True)
+                ranked = [self._permname_index(scope) for _, scope in dependent_scopes]
+                ranked_scope_cache[search_root] = ranked
+            return ranked
 
         def find_and_get_value(p_config: Dict, current_results: Dict) -> Optional[Any]:
             permname = p_config.get('permname')
@@ -513,7 +601,7 @@ class DataLoaderService:
             if driver_permname:
                 driver_value = current_results.get(driver_permname)
                 if driver_value is not None:
-                    dynamic_index = ime_x_mode_to_index.get(str(driver_value))
+                    dynamic_index = _IMEX_MODE_IDX.get(str(driver_value))
                     if dynamic_index is not None:
                         search_config['entry_index'] = dynamic_index
 
@@ -526,43 +614,29 @@ class DataLoaderService:
 
             found_element = None
 
-            dependent_scopes = []
-            for dep_element in search_root.iter('dependent'):
-                pol_attr = dep_element.get('polarity')
-                src_attr = dep_element.get('source')
-                
-                src_match = (src_attr and ion_source and src_attr.lower() == ion_source.lower())
-                pol_match = (pol_attr and ion_polarity and pol_attr.lower() == ion_polarity.lower())
-
-                if pol_match and src_match:
-                    dependent_scopes.insert(0, (3, dep_element)) 
-                elif pol_match:
-                    dependent_scopes.append((2, dep_element)) 
-                elif src_match:
-                    dependent_scopes.append((1, dep_element)) 
-            
-            dependent_scopes.sort(key=lambda x: x[0], reverse=True)
-
-            for _, scope in dependent_scopes:
-                target = scope.find(f".//*[@permname='{permname}']")
+            for scope_index in ranked_dependent_indexes(search_root):
+                target = scope_index.get(permname)
                 if target is not None:
                     found_element = target
-                    break 
+                    break
 
             if found_element is None:
-                found_element = search_root.find(f".//*[@permname='{permname}']")
+                found_element = self._permname_index(search_root).get(permname)
 
             return self._get_value_from_element(found_element, search_config)
 
-        dependent_params = [] 
-        independent_params = [] 
-        for p in param_info: 
-            permname = p.get('permname') 
-            if permname and all_param_defs_map.get(permname, {}).get('lookup_driven_by'): 
-                dependent_params.append(p) 
-            else: 
-                independent_params.append(p) 
-        
+        if param_info is self.config.all_definitions:
+            independent_params, dependent_params = self.config.all_definitions_partitioned
+        else:
+            dependent_params = []
+            independent_params = []
+            for p in param_info:
+                permname = p.get('permname')
+                if permname and all_param_defs_map.get(permname, {}).get('lookup_driven_by'):
+                    dependent_params.append(p)
+                else:
+                    independent_params.append(p)
+
         for p_config in independent_params: 
             value = find_and_get_value(p_config, results) 
             if value is not None: 
@@ -578,10 +652,18 @@ class DataLoaderService:
     def get_parameter_value_for_source(self, dataset: Dataset, permname: str, ion_source: str) -> Any:
         try:
             active_segment = dataset.segments[dataset.active_segment_index]
-            param_config = next((p for p in self.config.all_definitions if p['permname'] == permname), {'permname': permname})
-            
+
+            # The UI re-requests the same segment/permname/source triples on
+            # every row render; memoize per loaded tree (cleared on reload).
+            cache_key = (id(active_segment.xml_scope_element), permname,
+                         ion_source, active_segment.ion_polarity)
+            if cache_key in self._source_value_cache:
+                return self._source_value_cache[cache_key]
+
+            param_config = self.config.by_permname.get(permname, {'permname': permname})
+
             instrument_scope = dataset.xml_root.find('instrument') if dataset.xml_root else None
-            
+
             values = self._parse_parameters_for_scope(
                 param_scope_element=active_segment.xml_scope_element, 
                 instrument_scope_element=instrument_scope,
@@ -590,20 +672,20 @@ class DataLoaderService:
                 ion_source=ion_source
             )
             
-            return values.get(permname)
+            value = values.get(permname)
+            self._source_value_cache[cache_key] = value
+            return value
         except (IndexError, StopIteration) as e:
             self.logger.warning(f"Could not get parameter value for source '{ion_source}': {e}")
             return None
 
     def _calculate_energy_ramping_params(self, segment: Segment):
-        self.logger = logging.getLogger(__name__) 
-        
         is_advanced_str = segment.parameters.get("Energy_Ramping_Advanced_Settings_Active") 
         is_advanced = (is_advanced_str == '1') 
         segment.parameters["calc_advanced_ce_ramping_display_list"] = None 
 
         if not is_advanced: 
-            all_defs_map = {p['permname']: p for p in self.config.all_definitions} 
+            all_defs_map = self.config.by_permname 
             ce_config = all_defs_map.get("Energy_Ramping_Collision_Energy_StartEnd", {}) 
             mobility_config = all_defs_map.get("Energy_Ramping_Mobility_StartEnd", {}) 
             
@@ -630,12 +712,11 @@ class DataLoaderService:
             advanced_mobility_values_str = segment.parameters.get("Energy_Ramping_Advanced_ListMobilityValues") 
             advanced_ce_values_str = segment.parameters.get("Energy_Ramping_Advanced_ListCollisionEnergyValues") 
             advanced_entry_types_str = segment.parameters.get("Energy_Ramping_Advanced_ListEntryType") 
-            formatted_entries = []
-            
-            self.logger.debug("Calculating Advanced CE Ramping:")
-            self.logger.debug(f"  - Found Mobility Values: {advanced_mobility_values_str}")
-            self.logger.debug(f"  - Found CE Values: {advanced_ce_values_str}")
-            self.logger.debug(f"  - Found Entry Types: {advanced_entry_types_str}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Calculating Advanced CE Ramping:")
+                self.logger.debug("  - Found Mobility Values: %s", advanced_mobility_values_str)
+                self.logger.debug("  - Found CE Values: %s", advanced_ce_values_str)
+                self.logger.debug("  - Found Entry Types: %s", advanced_entry_types_str)
 
             if advanced_mobility_values_str and advanced_ce_values_str:
                 try: 
@@ -651,14 +732,16 @@ class DataLoaderService:
                     if not (len(mobility_values) == len(ce_values) == len(entry_types)): 
                         raise ValueError("Mismatch in lengths of advanced ramping lists.") 
 
-                    for i in range(len(mobility_values)): 
-                        entry_type_str = "base" if entry_types[i] == 0 else "fixed" if entry_types[i] == 1 else str(entry_types[i]) 
-                        formatted_entries.append(f"{entry_type_str} {ce_values[i]:.2f} eV @ {mobility_values[i]:.2f}") 
-                    
-                    self.logger.debug(f"  - Successfully generated advanced CE list: {formatted_entries}")
+                    type_names = {0: "base", 1: "fixed"}
+                    formatted_entries = [
+                        f"{type_names.get(entry_type, entry_type)} {ce:.2f} eV @ {mobility:.2f}"
+                        for entry_type, ce, mobility in zip(entry_types, ce_values, mobility_values)
+                    ]
+
+                    self.logger.debug("  - Successfully generated advanced CE list: %s", formatted_entries)
                     segment.parameters["calc_advanced_ce_ramping_display_list"] = formatted_entries 
-                except (ValueError, TypeError) as e: 
-                    self.logger.error(f"  - Error parsing advanced ramping values: {e}")
+                except (ValueError, TypeError) as e:
+                    self.logger.error("  - Error parsing advanced ramping values: %s", e)
                     segment.parameters["calc_advanced_ce_ramping_display_list"] = [f"Error parsing advanced values: {e}"] 
             else: 
                 self.logger.warning("  - Calculation skipped: Missing Mobility or CE value lists.")
@@ -673,7 +756,7 @@ class DataLoaderService:
             return
 
         stepping_details = []
-        all_defs_map = {p['permname']: p for p in self.config.all_definitions}
+        all_defs_map = self.config.by_permname
 
         ce_step1 = segment.parameters.get("Energy_Ramping_Collision_Energy_StartEnd")
         ce_step2 = segment.parameters.get("Energy_Ramping_Collision_Energy_StartEnd_Tims_Step_2")
@@ -751,15 +834,26 @@ class DataLoaderService:
         except (ValueError, TypeError): 
             segment.parameters["calc_cycle_time"] = "N/A"
             
-    def _process_dia_pasef_data(self, segment: Segment, search_path: str): 
+    @staticmethod
+    def _open_sqlite_readonly(sqlite_file: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(f'file:{sqlite_file}?mode=ro', uri=True)
+        # Read-only settings-file connection: keep temp structures in memory
+        # and let SQLite mmap the file instead of paging through its cache.
+        conn.execute("PRAGMA query_only=1")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("PRAGMA mmap_size=1073741824")
+        return conn
+
+    def _process_dia_pasef_data(self, segment: Segment, search_path: str):
         sqlite_file = self._find_file(search_path, ["diasettings.diasqlite"]) 
         if not sqlite_file:  
             self._initialize_dia_params_as_na(segment) 
             return 
         df = pd.DataFrame() 
         try: 
-            conn = sqlite3.connect(f'file:{sqlite_file}?mode=ro', uri=True) 
-            query = "SELECT Id, Type, CycleId, OneOverK0Start, OneOverK0End, IsolationMz, IsolationWidth FROM DiaWindowsSpecification" 
+            conn = self._open_sqlite_readonly(sqlite_file)
+            query = "SELECT Id, Type, CycleId, OneOverK0Start, OneOverK0End, IsolationMz, IsolationWidth FROM DiaWindowsSpecification"
             df = pd.read_sql_query(query, conn) 
             conn.close() 
         except Exception: 
@@ -773,8 +867,9 @@ class DataLoaderService:
             segment.dia_windows_data = pd.DataFrame() 
             self._initialize_dia_params_as_na(segment) 
             return 
-        pasef_scans_df = df[df['Type'] == 1].copy() 
-        ms1_scans = len(df[df['Type'] == 0]) 
+        scan_types = df['Type'].to_numpy()
+        pasef_scans_df = df.loc[scan_types == 1]
+        ms1_scans = int(np.count_nonzero(scan_types == 0))
         segment.parameters["calc_ms1_scans"] = ms1_scans 
         if not pasef_scans_df.empty: 
             num_ramps = pasef_scans_df['CycleId'].max() 
@@ -782,9 +877,10 @@ class DataLoaderService:
             segment.parameters["calc_steps"] = pasef_scans_df['CycleId'].value_counts().max() 
             unique_widths = pasef_scans_df['IsolationWidth'].nunique() 
             segment.parameters["calc_mz_width"] = f"static ({pasef_scans_df['IsolationWidth'].iloc[0]:.1f})" if unique_widths == 1 else "variable" 
-            min_mz_row = pasef_scans_df.loc[pasef_scans_df['IsolationMz'].idxmin()] 
-            max_mz_row = pasef_scans_df.loc[pasef_scans_df['IsolationMz'].idxmax()] 
-            segment.parameters["calc_scan_area_mz"] = f"{min_mz_row['IsolationMz'] - min_mz_row['IsolationWidth'] / 2:.2f} m/z - {max_mz_row['IsolationMz'] + max_mz_row['IsolationWidth'] / 2:.2f} m/z" 
+            iso_mz = pasef_scans_df['IsolationMz'].to_numpy()
+            iso_width = pasef_scans_df['IsolationWidth'].to_numpy()
+            imin, imax = int(np.argmin(iso_mz)), int(np.argmax(iso_mz))
+            segment.parameters["calc_scan_area_mz"] = f"{iso_mz[imin] - iso_width[imin] / 2:.2f} m/z - {iso_mz[imax] + iso_width[imax] / 2:.2f} m/z"
             segment.parameters["calc_scan_area_im"] = f"{pasef_scans_df['OneOverK0Start'].min():.4f} - {pasef_scans_df['OneOverK0End'].max():.4f}" 
             try: 
                 ramp_time_ms = float(segment.parameters.get("IMS_imeX_RampTime") or 0) 
@@ -803,16 +899,18 @@ class DataLoaderService:
             global_ramp_start, global_ramp_end = float(ramp_start_val), float(ramp_end_val) 
             use_global_limits = True 
         except (ValueError, TypeError, AttributeError): pass 
-        df_prepared = df.copy() 
-        df_prepared['x_start'] = df_prepared['IsolationMz'] - (df_prepared['IsolationWidth'] / 2) 
-        if use_global_limits and not df.empty: 
-            min_k0_in_data, max_k0_in_data = df['OneOverK0Start'].min(), df['OneOverK0End'].max() 
-            df_prepared['plot_y_start'] = df_prepared.apply(lambda r: global_ramp_start if r['OneOverK0Start'] == min_k0_in_data else r['OneOverK0Start'], axis=1) 
-            df_prepared['plot_y_end'] = df_prepared.apply(lambda r: global_ramp_end if r['OneOverK0End'] == max_k0_in_data else r['OneOverK0End'], axis=1) 
-        else: 
-            df_prepared['plot_y_start'] = df_prepared['OneOverK0Start'] 
-            df_prepared['plot_y_end'] = df_prepared['OneOverK0End'] 
-        segment.dia_windows_data = df_prepared 
+        # df is freshly loaded and owned by this method, so the derived plot
+        # columns are attached in place rather than on a deep copy.
+        k0_start = df['OneOverK0Start'].to_numpy()
+        k0_end = df['OneOverK0End'].to_numpy()
+        df['x_start'] = df['IsolationMz'].to_numpy() - df['IsolationWidth'].to_numpy() / 2
+        if use_global_limits and len(df):
+            df['plot_y_start'] = np.where(k0_start == k0_start.min(), global_ramp_start, k0_start)
+            df['plot_y_end'] = np.where(k0_end == k0_end.max(), global_ramp_end, k0_end)
+        else:
+            df['plot_y_start'] = k0_start
+            df['plot_y_end'] = k0_end
+        segment.dia_windows_data = df
 
     def _initialize_dia_params_as_na(self, segment: Segment, ms1_scans_only=False): 
         if not ms1_scans_only: segment.parameters["calc_ms1_scans"] = "N/A" 
@@ -832,8 +930,8 @@ class DataLoaderService:
         conn = None
         
         try: 
-            conn = sqlite3.connect(f'file:{sqlite_file}?mode=ro', uri=True) 
-            
+            conn = self._open_sqlite_readonly(sqlite_file)
+
             try:
                 diag_df = pd.read_sql_query("SELECT * FROM Slices", conn)
                 if not diag_df.empty:
@@ -983,27 +1081,45 @@ class DataLoaderService:
             if conn:
                 conn.close()
     
-    def _find_file(self, start_folder: str, file_patterns: List[str]) -> Optional[str]: 
-        for root, _, files in os.walk(start_folder): 
-            for file in files: 
-                for pattern in file_patterns: 
-                    if file.lower() == pattern.lower(): 
-                        return os.path.join(root, file) 
-        return None 
+    def _find_file(self, start_folder: str, file_patterns: List[str]) -> Optional[str]:
+        # One walk per folder per load: the first call indexes every file by
+        # lowercased name, later lookups are dict probes instead of re-walks.
+        index = self._find_cache.get(start_folder)
+        if index is None:
+            index = {}
+            pending = deque([start_folder])
+            while pending:
+                try:
+                    with os.scandir(pending.popleft()) as entries:
+                        for entry in entries:
+                            if entry.is_dir(follow_symlinks=False):
+                                pending.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                index.setdefault(entry.name.lower(), entry.path)
+                except OSError:
+                    continue
+            self._find_cache[start_folder] = index
+
+        for pattern in file_patterns:
+            found = index.get(pattern.lower())
+            if found is not None:
+                return found
+        return None
     
     def parse_additional_parameters(self, dataset: Dataset, additional_params_info: List[Dict], ion_source: Optional[str] = None): 
         if not hasattr(dataset, 'xml_root') or not additional_params_info: 
             return 
-        instrument_scope_element = dataset.xml_root.find('instrument') 
-        
-        all_defs_map = {p['permname']: p for p in self.config.all_definitions} 
-        polarity_map = all_defs_map.get("Mode_IonPolarity", {}).get("value_map", {}) 
-        
-        last_segment_params = {} 
-        for segment in dataset.segments: 
-            final_polarity_raw_val = last_segment_params.get("Mode_IonPolarity") 
+        instrument_scope_element = dataset.xml_root.find('instrument')
+
+        polarity_map = self.config.polarity_value_map
+
+        # Rolling carry-forward state, mutated in place instead of re-copied
+        # from the growing parameter dict on every segment.
+        rolling_params = {}
+        for segment in dataset.segments:
+            final_polarity_raw_val = rolling_params.get("Mode_IonPolarity")
             
-            current_polarity_el = segment.xml_scope_element.find(f".//*[@permname='Mode_IonPolarity']") 
+            current_polarity_el = self._permname_index(segment.xml_scope_element).get('Mode_IonPolarity') 
             polarity_val_current = self._get_value_from_element(current_polarity_el, {}) 
             
             if polarity_val_current is not None: 
@@ -1019,9 +1135,9 @@ class DataLoaderService:
                 ion_polarity=polarity_string,
                 ion_source=ion_source 
             ) 
-            segment.parameters.update(last_segment_params) 
-            segment.parameters.update(new_values) 
-            last_segment_params = segment.parameters.copy() 
+            segment.parameters.update(rolling_params)
+            segment.parameters.update(new_values)
+            rolling_params.update(segment.parameters)
     
     def save_user_view_definitions(self, view_data: Dict[str, List[str]]) -> bool:
         save_path = self.config.user_view_definitions_path
@@ -1030,11 +1146,20 @@ class DataLoaderService:
         try:
             config_dir = os.path.dirname(save_path)
             os.makedirs(config_dir, exist_ok=True)
-            
-            with open(save_path, 'w', encoding='utf-8') as f:
-                json.dump(view_data, f, indent=4)
-                
-            self.config._parameter_definitions = None
+
+            if _json is json:
+                payload = json.dumps(view_data, indent=4).encode('utf-8')
+            else:
+                payload = _json.dumps(view_data, option=_json.OPT_INDENT_2)
+
+            # Write to a sibling temp file and swap it in, so a crash
+            # mid-write can never leave a truncated definitions file behind.
+            tmp_path = save_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, save_path)
+
+            self.config.invalidate_parameter_definitions()
             return True
             
         except (IOError, OSError) as e:
@@ -1049,7 +1174,7 @@ class DataLoaderService:
             if os.path.exists(file_path):
                 os.remove(file_path)
                 
-            self.config._parameter_definitions = None
+            self.config.invalidate_parameter_definitions()
             return True
             
         except (IOError, OSError) as e:
@@ -1058,8 +1183,10 @@ class DataLoaderService:
 
 
 class PlottingService: 
-    def generate_plot_as_buffer(self, dataset: Dataset, width_px: int, height_px: int, bg_color: str = "#E4EFF7", for_report: bool = False, dpi: int = 100, show_filename: bool = True, autofit: bool = True) -> Optional[io.BytesIO]: 
-        try: 
+    __slots__ = ()
+
+    def _generate_plot_figure(self, dataset: Dataset, width_px: int, height_px: int, bg_color: str = "#E4EFF7", for_report: bool = False, show_filename: bool = True, autofit: bool = True) -> Optional[plt.Figure]:
+        try:
             active_segment = dataset.segments[dataset.active_segment_index] 
         except IndexError: 
             return None 
@@ -1093,23 +1220,34 @@ class PlottingService:
         elif scan_mode_id == 11 and active_segment.diagonal_pasef_data is not None: # diagonal-PASEF 
             fig, _ = self._draw_diagonal_plot_figure(active_segment, title, width_px, height_px, bg_color, for_report, is_vector=False, autofit=autofit, mz_range=mz_range, k0_range=k0_range) 
         elif scan_mode_id == 6 and active_segment.pasef_polygon_data: # PASEF 
-            fig, _ = self._draw_pasef_plot_figure(active_segment, title, width_px, height_px, bg_color, for_report, is_vector=False, autofit=autofit, mz_range=mz_range, k0_range=k0_range) 
-        
-        if fig: 
-            if for_report: 
-                fig.subplots_adjust(left=0.15, right=0.95, bottom=0.22, top=0.85) 
-            return self._render_figure_to_buffer(fig, dpi, 'png') 
+            fig, _ = self._draw_pasef_plot_figure(active_segment, title, width_px, height_px, bg_color, for_report, is_vector=False, autofit=autofit, mz_range=mz_range, k0_range=k0_range)
+
+        if fig and for_report:
+            fig.subplots_adjust(left=0.15, right=0.95, bottom=0.22, top=0.85)
+        return fig
+
+    def generate_plot_as_buffer(self, dataset: Dataset, width_px: int, height_px: int, bg_color: str = "#E4EFF7", for_report: bool = False, dpi: int = 100, show_filename: bool = True, autofit: bool = True) -> Optional[io.BytesIO]:
+        fig = self._generate_plot_figure(dataset, width_px, height_px, bg_color, for_report, show_filename, autofit)
+        if fig:
+            return self._render_figure_to_buffer(fig, dpi, 'png')
         return None
-        
-    def create_plot_image(self, dataset: Dataset, width_px: int, height_px: int, autofit: bool = True) -> Optional[ctk.CTkImage]: 
-        plot_buffer = self.generate_plot_as_buffer(dataset, width_px, height_px, autofit=autofit) 
-        if plot_buffer: 
-            image = Image.open(plot_buffer) 
-            image.load() 
-            plot_buffer.close() 
-            return ctk.CTkImage(light_image=image, dark_image=image, size=(image.width, image.height)) 
+
+    def create_plot_image(self, dataset: Dataset, width_px: int, height_px: int, autofit: bool = True) -> Optional[ctk.CTkImage]:
+        # The on-screen path grabs the Agg canvas pixels directly; encoding
+        # to PNG and decoding it again with PIL would be pure overhead here.
+        fig = self._generate_plot_figure(dataset, width_px, height_px, autofit=autofit)
+        if fig:
+            image = self._render_figure_to_pil(fig)
+            return ctk.CTkImage(light_image=image, dark_image=image, size=(image.width, image.height))
         return None
 
+    def _render_figure_to_pil(self, fig: plt.Figure) -> Image.Image:
+        canvas = fig.canvas
+        canvas.draw()
+        image = Image.frombuffer('RGBA', canvas.get_width_height(), bytes(canvas.buffer_rgba()), 'raw', 'RGBA', 0, 1)
+        plt.close(fig)
+        return image
+
     def _setup_plot(self, width: float, height: float, title: str, bg_color: str, for_report: bool = False, is_vector: bool = False) -> Tuple[plt.Figure, plt.Axes]: 
         if for_report: 
             title_fs, label_fs, tick_fs = 14, 12, 10 
@@ -1159,15 +1297,19 @@ class PlottingService:
         if df_prepared is None or df_prepared.empty or 'CycleId' not in df_prepared.columns: 
             return None 
         fig, ax = self._setup_plot(width, height, title, bg_color, for_report, is_vector) 
-        unique_cycles = df_prepared['CycleId'].unique() 
-        colors = plt.cm.viridis_r(np.linspace(0, 1, len(unique_cycles))) 
-        cycle_color_map = dict(zip(unique_cycles, colors)) 
-        for _, row in df_prepared.iterrows(): 
-            rect_height = row['plot_y_end'] - row['plot_y_start'] 
-            rect = patches.Rectangle( 
-                (row['x_start'], row['plot_y_start']), row['IsolationWidth'], rect_height, 
-                linewidth=1, edgecolor='#04304D', facecolor=cycle_color_map[row['CycleId']], alpha=0.7) 
-            ax.add_patch(rect) 
+        unique_cycles = df_prepared['CycleId'].unique()
+        colors = plt.cm.viridis_r(np.linspace(0, 1, len(unique_cycles)))
+        cycle_color_map = dict(zip(unique_cycles, colors))
+        x_starts = df_prepared['x_start'].to_numpy()
+        y_starts = df_prepared['plot_y_start'].to_numpy()
+        widths = df_prepared['IsolationWidth'].to_numpy()
+        heights = df_prepared['plot_y_end'].to_numpy() - y_starts
+        facecolors = [cycle_color_map[c] for c in df_prepared['CycleId'].to_numpy()]
+        # One collection instead of one add_patch per window: matplotlib then
+        # handles transforms and autoscaling for all rectangles in a single pass.
+        rects = [patches.Rectangle((x_starts[i], y_starts[i]), widths[i], heights[i])
+                 for i in range(len(x_starts))]
+        ax.add_collection(PatchCollection(rects, facecolor=facecolors, edgecolor='#04304D', linewidth=1, alpha=0.7))
         if autofit:
             ax.autoscale_view()
         elif mz_range and k0_range:
@@ -1202,27 +1344,30 @@ class PlottingService:
             num_slices = len(pasef_slices_df)
             colors = plt.cm.viridis_r(np.linspace(0, 1, num_slices)) 
 
+            slice_polygons, slice_colors = [], []
             for i, row in enumerate(pasef_slices_df.itertuples()):
                 if row.slope == 0: continue
-                
+
                 half_width = row.isolation_mz / 2
-                
+
                 center_mz_bottom = (measured_mobility_start - row.origin) / row.slope
                 slice_start_mz_bottom = center_mz_bottom - half_width
                 slice_end_mz_bottom = center_mz_bottom + half_width
-                
+
                 center_mz_top = (measured_mobility_end - row.origin) / row.slope
                 slice_start_mz_top = center_mz_top - half_width
                 slice_end_mz_top = center_mz_top + half_width
-                
-                vertices = [ 
-                    (slice_start_mz_bottom, measured_mobility_start), 
-                    (slice_end_mz_bottom,   measured_mobility_start), 
-                    (slice_end_mz_top,      measured_mobility_end), 
-                    (slice_start_mz_top,    measured_mobility_end) 
-                ] 
-                polygon = patches.Polygon(vertices, linewidth=1, edgecolor='#04304D', facecolor=colors[i], alpha=0.7) 
-                ax.add_patch(polygon) 
+
+                vertices = [
+                    (slice_start_mz_bottom, measured_mobility_start),
+                    (slice_end_mz_bottom,   measured_mobility_start),
+                    (slice_end_mz_top,      measured_mobility_end),
+                    (slice_start_mz_top,    measured_mobility_end)
+                ]
+                slice_polygons.append(patches.Polygon(vertices))
+                slice_colors.append(colors[i])
+            if slice_polygons:
+                ax.add_collection(PatchCollection(slice_polygons, facecolor=slice_colors, edgecolor='#04304D', linewidth=1, alpha=0.7))
 
         elif isinstance(plot_data, dict):
             p = plot_data
@@ -1242,21 +1387,21 @@ class PlottingService:
             
             step_mz = total_pattern_width_mz / num_slices if num_slices > 0 else 0 
             
-            for i in range(num_slices): 
-                center_mz_bottom = center_mz1_first + (i * step_mz)
-                center_mz_top = center_mz2_first + (i * step_mz)
-                
-                slice_start_mz_bottom = center_mz_bottom - half_iso_width
-                slice_start_mz_top = center_mz_top - half_iso_width
-                slice_end_mz_bottom = center_mz_bottom + half_iso_width
-                slice_end_mz_top = center_mz_top + half_iso_width
-                
-                vertices = [ 
-                    (slice_start_mz_bottom, measured_mobility_start), (slice_end_mz_bottom,   measured_mobility_start), 
-                    (slice_end_mz_top,      measured_mobility_end), (slice_start_mz_top,    measured_mobility_end) 
-                ] 
-                polygon = patches.Polygon(vertices, linewidth=1, edgecolor='#04304D', facecolor=colors[i], alpha=0.7) 
-                ax.add_patch(polygon)
+            # The template pattern is perfectly regular, so all slice corners
+            # come out of broadcast arithmetic as one (slices, 4, 2) array.
+            slice_idx = np.arange(num_slices)
+            centers_bottom = center_mz1_first + slice_idx * step_mz
+            centers_top = center_mz2_first + slice_idx * step_mz
+            y_bottom = np.full(num_slices, measured_mobility_start)
+            y_top = np.full(num_slices, measured_mobility_end)
+            vertices = np.stack([
+                np.stack([centers_bottom - half_iso_width, y_bottom], axis=1),
+                np.stack([centers_bottom + half_iso_width, y_bottom], axis=1),
+                np.stack([centers_top + half_iso_width, y_top], axis=1),
+                np.stack([centers_top - half_iso_width, y_top], axis=1)
+            ], axis=1)
+            if num_slices > 0:
+                ax.add_collection(PolyCollection(vertices, facecolors=colors, edgecolor='#04304D', linewidth=1, alpha=0.7))
         else:
             plt.close(fig) 
             return None
@@ -1342,7 +1487,24 @@ class PlottingService:
             return self._render_figure_to_buffer(fig, 0, 'svg') 
         return None 
 
-class ReportGeneratorService: 
+@lru_cache(maxsize=1)
+def _report_font_bytes() -> Optional[Tuple[bytes, bytes, bytes]]:
+    """The DejaVu TTF files, read once per process for PDF generation."""
+    try:
+        with open(resource_path("assets/DejaVuSans.ttf"), 'rb') as f:
+            regular = f.read()
+        with open(resource_path("assets/DejaVuSans-Bold.ttf"), 'rb') as f:
+            bold = f.read()
+        with open(resource_path("assets/DejaVuSans-Oblique.ttf"), 'rb') as f:
+            italic = f.read()
+        return regular, bold, italic
+    except OSError:
+        return None
+
+
+class ReportGeneratorService:
+    __slots__ = ('plotting_service', 'config', 'loader', 'logger')
+
     def __init__(self, plotting_service: PlottingService, config: AppConfig, loader_service: DataLoaderService): 
         self.plotting_service = plotting_service 
         self.config = config 
@@ -1368,13 +1530,25 @@ class ReportGeneratorService:
         if not dataset or not dataset.segments: 
             return [] 
 
-        has_multisegment_file = len(dataset.segments) > 1 
-        has_advanced_ce = any(s.parameters.get("Energy_Ramping_Advanced_Settings_Active") == '1' for s in dataset.segments) 
-        has_standard_ce = any(s.parameters.get("Energy_Ramping_Advanced_Settings_Active") != '1' for s in dataset.segments) 
-        has_icc_mode1 = any(s.parameters.get("IMSICC_Mode") == '1' for s in dataset.segments) 
-        has_icc_mode2 = any(s.parameters.get("IMSICC_Mode") == '2' for s in dataset.segments) 
+        has_multisegment_file = len(dataset.segments) > 1
+        # One pass over the segments instead of four any() scans plus a
+        # workflow comprehension.
+        has_advanced_ce = has_standard_ce = has_icc_mode1 = has_icc_mode2 = False
+        all_workflows_in_dataset = set()
+        for s in dataset.segments:
+            params = s.parameters
+            if params.get("Energy_Ramping_Advanced_Settings_Active") == '1':
+                has_advanced_ce = True
+            else:
+                has_standard_ce = True
+            icc_mode = params.get("IMSICC_Mode")
+            if icc_mode == '1':
+                has_icc_mode1 = True
+            elif icc_mode == '2':
+                has_icc_mode2 = True
+            if s.workflow_name:
+                all_workflows_in_dataset.add(s.workflow_name)
 
-        all_workflows_in_dataset = {s.workflow_name for s in dataset.segments if s.workflow_name} 
         default_params_by_workflow = self.config.parameter_definitions 
 
         default_permnames_ordered = [] 
@@ -1393,7 +1567,7 @@ class ReportGeneratorService:
         if "calc_scan_mode" in seen_permnames and "Mode_ScanMode" in seen_permnames: 
             default_permnames_ordered.remove("Mode_ScanMode") 
 
-        all_definitions_map = {p['permname']: p for p in self.config.all_definitions} 
+        all_definitions_map = self.config.by_permname 
         default_param_configs = [] 
 
         for pname in default_permnames_ordered: 
@@ -1442,12 +1616,9 @@ class ReportGeneratorService:
                 final_value = f"{segment.start_time:.2f} min" 
             elif permname == "calc_segment_end_time": 
                 final_value = segment.end_time_display 
-            else: 
-                original_active_index = dataset.active_segment_index 
-                dataset.active_segment_index = segment_index 
-                raw_value = dataset.get_parameter_value(permname) 
-                dataset.active_segment_index = original_active_index 
-                final_value = raw_value if isinstance(raw_value, list) else format_parameter_value(raw_value, param_config) 
+            else:
+                raw_value = segment.parameters.get(permname)
+                final_value = raw_value if isinstance(raw_value, list) else format_parameter_value(raw_value, param_config)
 
             report_data.append({ 
                 "Parameter": param_config.get('label', permname), 
@@ -1492,16 +1663,16 @@ class ReportGeneratorService:
                 self.current_col = 0
                 
                 self.font_name = "Helvetica" # Default fallback font
+                font_set = _report_font_bytes()
                 try:
-                    font_regular_path = resource_path("assets/DejaVuSans.ttf")
-                    font_bold_path = resource_path("assets/DejaVuSans-Bold.ttf")
-                    font_italic_path = resource_path("assets/DejaVuSans-Oblique.ttf")
-
-                    self.add_font("DejaVu", "", font_regular_path)
-                    self.add_font("DejaVu", "B", font_bold_path)
-                    self.add_font("DejaVu", "I", font_italic_path)
-                    
-                    self.font_name = "DejaVu" 
+                    if font_set is None:
+                        raise RuntimeError("DejaVu font files missing")
+                    regular, bold, italic = font_set
+                    self.add_font("DejaVu", "", io.BytesIO(regular))
+                    self.add_font("DejaVu", "B", io.BytesIO(bold))
+                    self.add_font("DejaVu", "I", io.BytesIO(italic))
+
+                    self.font_name = "DejaVu"
                 except RuntimeError:
                     logging.getLogger(__name__).warning(
                         "DejaVu font files not found in assets/. PDF report will fall back to Helvetica."
@@ -8,6 +8,7 @@ import settings
 
 import sys
 import os
+from functools import lru_cache
 
 def format_parameter_value(value: Any, param_config: Dict) -> str:
     if value is None or value == '':
@@ -47,6 +48,7 @@ def format_parameter_value(value: Any, param_config: Dict) -> str:
     else:
         return formatted_string
     
+@lru_cache(maxsize=64)
 def resource_path(relative_path):
     try:
         base_path = sys._MEIPASS